@@ -1,24 +1,41 @@
 # app/db.py
 from __future__ import annotations
-import os
-from sqlalchemy import create_engine
+import atexit
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+from app.settings import get_settings
+
+DATABASE_URL = get_settings().database_url
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL not set")
 
-engine = create_engine(DATABASE_URL, future=True)
+# Batch executemany INSERTs into multi-VALUES statements (SQLAlchemy insertmanyvalues)
+_engine_kwargs: dict = {"insertmanyvalues_page_size": 1000}
+_url = make_url(DATABASE_URL)
+if _url.get_driver_name() == "psycopg2":
+    _engine_kwargs["executemany_mode"] = "values_plus_batch"
+if _url.get_backend_name() == "postgresql":
+    _engine_kwargs["connect_args"] = {"connect_timeout": 5, "application_name": "fii_dii_scraper"}
+
+# Small warm pool for sporadic scrapes; pre-ping swaps a NAT-dropped connection
+# for a fresh one up front instead of failing (or reconnecting) mid-statement.
+engine = create_engine(
+    DATABASE_URL,
+    future=True,
+    pool_size=2,
+    max_overflow=2,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    **_engine_kwargs,
+)
+atexit.register(engine.dispose)  # Close pooled connections cleanly when a cron run exits
 
-# Keep attributes available after commit for simple service returns/prints
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
     autocommit=False,
     future=True,
-    expire_on_commit=False,
 )
 
 def get_session():
@@ -0,0 +1,33 @@
+# app/http_client.py
+"""Process-wide httpx client shared by the NSE fetcher and the Telegram notifier."""
+
+from __future__ import annotations
+
+import atexit
+import threading
+
+import httpx
+
+_client: httpx.Client | None = None
+_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """
+    Return the shared HTTP/2 client, creating it on first use.
+    One TLS context, DNS cache and connection pool serve every outbound call;
+    callers pass their own headers/timeouts per request.
+    """
+    global _client  # noqa: PLW0603
+    with _lock:
+        if _client is None:
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=3,  # Reconnect on connect errors; status-level retries are up to callers
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            )
+            _client = httpx.Client(
+                transport=transport, timeout=20.0, follow_redirects=True
+            )
+            atexit.register(_client.close)
+        return _client
@@ -1,9 +1,8 @@
 # app/models.py
 from __future__ import annotations
 from datetime import date
-from decimal import Decimal
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Date, Numeric, Column, DateTime
+from sqlalchemy import BigInteger, Date, Column, DateTime, func
 
 class Base(DeclarativeBase):
     pass
@@ -11,12 +10,13 @@ class Base(DeclarativeBase):
 class TNseFiiDiiEqData(Base):
     __tablename__ = "t_nse_fii_dii_eq_data"
 
+    # Amounts are integer hundredths of a ₹ crore (i.e. ₹ lakh): 15,515.91 Cr -> 1551591
     run_dt: Mapped[date] = mapped_column(Date, primary_key=True)
-    dii_buy: Mapped[Decimal | None] = mapped_column(Numeric(9, 2), nullable=True)
-    dii_sell: Mapped[Decimal | None] = mapped_column(Numeric(9, 2), nullable=True)
-    dii_net: Mapped[Decimal | None] = mapped_column(Numeric(7, 2), nullable=True)
-    fii_buy: Mapped[Decimal | None] = mapped_column(Numeric(9, 2), nullable=True)
-    fii_sell: Mapped[Decimal | None] = mapped_column(Numeric(9, 2), nullable=True)
-    fii_net: Mapped[Decimal | None] = mapped_column(Numeric(7, 2), nullable=True)
-    i_ts = Column(DateTime(timezone=True))
+    dii_buy: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    dii_sell: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    dii_net: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    fii_buy: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    fii_sell: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    fii_net: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    i_ts = Column(DateTime(timezone=True), server_default=func.now())  # Stamped by the DB clock
     u_ts = Column(DateTime(timezone=True))
\ No newline at end of file
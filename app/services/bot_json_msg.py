@@ -1,32 +1,85 @@
 # app/services/bot_json_msg.py
 from __future__ import annotations
-import os
-import requests
+import hashlib
+import sys
+import uuid
+import httpx
+import orjson
 from typing import Any, Dict, List
-from dotenv import load_dotenv
 
-# Load .env for BOT_TOKEN and CHAT_ID
-load_dotenv()
+from app.http_client import get_client
+from app.services.retry import RecoverableError, parse_retry_after, retry
+from app.settings import get_settings
 
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-CHAT_ID = os.getenv("CHAT_ID")
+# BOT_TOKEN and CHAT_ID come from the environment / .env (loaded by app.settings)
+_settings = get_settings()
+BOT_TOKEN = _settings.bot_token
+CHAT_ID = _settings.chat_id
+API_URL = _settings.api_url
+
+_BODY_STATIC = {"parse_mode": "HTML", "disable_web_page_preview": True}  # Fields identical on every send
+
+# The request body is serialized once; each send only splices its JSON-encoded text into the slot.
+_TEXT_SENTINEL = f"__text_{uuid.uuid4().hex}__"
+_TEXT_SLOT = orjson.dumps(_TEXT_SENTINEL)
+_TEMPLATE = orjson.dumps({**_BODY_STATIC, "chat_id": CHAT_ID, "text": _TEXT_SENTINEL})
 
-API_URL = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage" if BOT_TOKEN else None
 class TelegramSendError(Exception):
     pass
 
+_K_CAT, _K_BUY, _K_SELL, _K_NET, _K_DATE = map(sys.intern, (  # Same objects br_nse keys its rows with
+    "Category", "Buy Value(₹ Crores)", "Sell Value (₹ Crores)", "Net Value (₹ Crores)", "Date"
+))
+_NL = "\n"
+_MAX_TEXT = 4000  # Telegram rejects sendMessage text over 4096 chars; keep some headroom
+_LAST_SENT: tuple[bytes, int] = (b"", 0)  # (digest of the last message text, chunks of it delivered)
+
 def _format_rows_to_text(rows: List[Dict[str, Any]]) -> str:
     if not rows:
         return "<pre>No data</pre>"
-    run_date = rows[0].get("Date", "")
-    lines = [f"FII/DII Equity Flows — {run_date}"]
-    for r in rows:
-        cat = str(r.get("Category", "")).strip()
-        buy = str(r.get("Buy Value(₹ Crores)", "")).strip()
-        sell = str(r.get("Sell Value (₹ Crores)", "")).strip()
-        net = str(r.get("Net Value (₹ Crores)", "")).strip()
-        lines.append(f"{cat}: Buy {buy} | Sell {sell} | Net {net}")
-    return f"<pre>{chr(10).join(lines)}</pre>"
+    head = f"FII/DII Equity Flows — {rows[0].get(_K_DATE, '')}"
+    body = _NL.join(
+        f"{str(r.get(_K_CAT, '')).strip()}: Buy {str(r.get(_K_BUY, '')).strip()}"
+        f" | Sell {str(r.get(_K_SELL, '')).strip()} | Net {str(r.get(_K_NET, '')).strip()}"
+        for r in rows
+    )
+    return f"<pre>{head}{_NL}{body}</pre>"
+
+def _split_text(text: str) -> list[str]:
+    """Split a <pre> message on line boundaries into chunks that each fit _MAX_TEXT.
+    A single line longer than the budget is hard-split into budget-sized pieces.
+    """
+    if len(text) <= _MAX_TEXT:
+        return [text]
+    budget = _MAX_TEXT - len("<pre></pre>")
+    width = budget - 1  # Room for the joining newline
+    lines: list[str] = []
+    for line in text[len("<pre>"):-len("</pre>")].split(_NL):
+        lines.extend(line[i:i + width] for i in range(0, max(len(line), 1), width))  # Empty lines kept as-is
+    chunks: list[list[str]] = [[]]
+    size = 0
+    for line in lines:
+        if chunks[-1] and size + len(line) + 1 > budget:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(line)
+        size += len(line) + 1
+    return [f"<pre>{_NL.join(c)}</pre>" for c in chunks]
+
+def _send(body: bytes) -> httpx.Response:
+    """POST once over the shared keep-alive client; 429/5xx and network errors raise RecoverableError."""
+    try:
+        resp = get_client().post(
+            API_URL,
+            content=body,
+            headers={"Content-Type": "application/json"},
+            timeout=10.0,
+        )
+    except httpx.TransportError as e:
+        raise RecoverableError(f"Network error: {e}") from e
+    if resp.status_code == httpx.codes.TOO_MANY_REQUESTS or resp.is_server_error:
+        raise RecoverableError(f"HTTP {resp.status_code}: {resp.text}", retry_after=parse_retry_after(resp.headers.get("Retry-After")))
+    return resp
 
 def bot_json_msg(payload: Dict[str, Any] | List[Dict[str, Any]]) -> None:
     """
@@ -53,17 +106,26 @@ def bot_json_msg(payload: Dict[str, Any] | List[Dict[str, Any]]) -> None:
 
     text = _format_rows_to_text(rows)
 
-    body = {
-        "chat_id": CHAT_ID,
-        "text": text,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True,
-    }
+    global _LAST_SENT  # noqa: PLW0603
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    chunks = _split_text(text)
+    # Resume after the chunks already delivered for this same text, so a retry after a
+    # mid-message failure doesn't repeat them; a fully delivered text is skipped outright.
+    last_digest, delivered = _LAST_SENT
+    for i in range(delivered if digest == last_digest else 0, len(chunks)):
+        _send_text(chunks[i])
+        _LAST_SENT = (digest, i + 1)
+    return None
+
+def _send_text(text: str) -> None:
+    body = _TEMPLATE.replace(_TEXT_SLOT, orjson.dumps(text), 1)
 
-    resp = requests.post(API_URL, json=body, timeout=10.0)
-    if resp.status_code != 200:
+    try:
+        resp = retry(lambda: _send(body))
+    except RecoverableError as e:
+        raise TelegramSendError(str(e)) from e
+    if resp.status_code != httpx.codes.OK:
         raise TelegramSendError(f"HTTP {resp.status_code}: {resp.text}")
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if not data.get("ok", False):
         raise TelegramSendError(f"Telegram error: {data.get('description', 'Unknown error')}")
-    return None
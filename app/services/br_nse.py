@@ -1,9 +1,23 @@
 # app/services/br_nse.py
-"""Robust Playwright scraper for the combined (NSE, BSE, MSEI) FII/DII table with strict header scoping, env-overridable waits, reliable row readiness, and HTTP/2 fallbacks."""
+"""Fetcher for the combined (NSE, BSE, MSEI) FII/DII table: direct HTTP/2 against NSE's JSON API with a static-HTML (lxml) fallback, and the robust Playwright scraper (strict header scoping, env-overridable waits, reliable row readiness) kept as an opt-in last resort."""
 from __future__ import annotations
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout, Page
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+from playwright.sync_api import sync_playwright, Page, Playwright, Browser, BrowserContext, Route
+from lxml import html as lxml_html
+import httpx
+import orjson
+
+import app.settings  # noqa: F401  Loads .env before the env-driven constants below are read
+from app.http_client import get_client
+from app.services.retry import RecoverableError, parse_retry_after, retry
+import atexit
 import os
 import re
+import sys
+import threading
 import time
 
 # -------------------------------
@@ -25,7 +39,6 @@ def _env_s(name: str, default_s: float) -> float:
         return default_s
 
 # Timeout and delay constants with env overrides (defaults tuned for NSE)
-NAV_NETWORK_IDLE_MS        = _env_ms("NAV_NETWORK_IDLE_MS", 8000)      # page.wait_for_load_state("networkidle") [ms] [web:118]
 HEADER_APPEAR_MS           = _env_ms("HEADER_APPEAR_MS", 12000)        # heading wait [ms] [web:36]
 TABLE_VISIBLE_MS           = _env_ms("TABLE_VISIBLE_MS", 10000)        # table visible wait [ms] [web:36]
 THEAD_READY_MS             = _env_ms("THEAD_READY_MS", 12000)          # thead ready wait [ms] [web:36]
@@ -39,31 +52,253 @@ KEY_END_DELAY_S            = _env_s("KEY_END_DELAY_S", 0.5)            # after E
 KEY_HOME_DELAY_S           = _env_s("KEY_HOME_DELAY_S", 0.3)           # after Home key [s] [web:36]
 ENGINE_RETRY_DELAY_S       = _env_s("ENGINE_RETRY_DELAY_S", 1.0)       # between browser engines [s] [web:118]
 
+# Direct HTTP path
+HTTP_TIMEOUT_S             = _env_s("HTTP_TIMEOUT_S", 20.0)            # per-request httpx timeout [s]
+USE_BROWSER                = os.getenv("NSE_USE_BROWSER") == "1"       # allow Playwright as last-resort fallback
+NSE_CACHE_TTL_S            = _env_s("NSE_CACHE_TTL_S", 0.0)            # reuse today's API payload this long; 0 = off [s]
+NSE_CACHE_DIR              = Path(os.getenv("NSE_CACHE_DIR", ".nse_cache"))
+IST                        = ZoneInfo("Asia/Kolkata")
+
 # -------------------------------
 # Scraper configuration/constants
 # -------------------------------
 
 NSE_URL = "https://www.nseindia.com/reports/fii-dii"  # Target reports page hosting both tables. [web:6]
 HEADER_TEXT = "FII/FPI & DII trading activity on NSE, BSE and MSEI in Capital Market Segment"  # Only target the long combined heading. [web:6]
+_HEADER_RE = re.compile(rf"^{re.escape(HEADER_TEXT)}$")  # Full-string anchored regex, compiled once. [web:36]
+
+NSE_BASE_URL = "https://www.nseindia.com"  # Homepage; visiting it sets the cookies the API requires.
+FII_DII_API_PATH = "/api/fiidiiTradeReact"  # JSON feed behind the combined table on the reports page.
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)  # Realistic UA shared by the HTTP client and the browser context.
+
+BROWSER_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": NSE_URL,
+}  # NSE rejects API calls that do not look like they come from its own page.
 
-JS_PARSE_TABLE = (
-    "(el) => {\n"
-    "  const thead = el.querySelector('thead');\n"
-    "  const tbody = el.querySelector('tbody');\n"
-    "  if (!thead || !tbody) return [];\n"
-    "  const headers = Array.from(thead.querySelectorAll('th')).map(x => x.textContent.trim());\n"
-    "  const out = [];\n"
-    "  for (const tr of tbody.querySelectorAll('tr')) {\n"
-    "    const cells = Array.from(tr.querySelectorAll('td')).map(x => x.textContent.trim());\n"
-    "    if (cells.length === headers.length) {\n"
-    "      const row = {};\n"
-    "      headers.forEach((h, i) => row[h] = cells[i]);\n"
-    "      out.push(row);\n"
-    "    }\n"
-    "  }\n"
-    "  return out;\n"
-    "}"
-)  # In-page JS to map thead headers to tbody row cells as list[dict]. [web:24]
+API_FIELD_MAP = (
+    ("category", "Category"),
+    ("date", "Date"),
+    ("buyValue", sys.intern("Buy Value(₹ Crores)")),
+    ("sellValue", sys.intern("Sell Value (₹ Crores)")),
+    ("netValue", sys.intern("Net Value (₹ Crores)")),
+)  # API field -> table header, so every path returns identically keyed rows; interned so consumers' key constants are the same objects.
+
+# -------------------------------
+# Direct HTTP fetch (no browser)
+# -------------------------------
+
+RETRY_STATUSES = frozenset({401, 403, 419, 429, 500, 502, 503, 504})  # Transient NSE/Akamai answers worth retrying.
+AUTH_STATUSES = frozenset({401, 403, 419})  # Cookies rejected: re-warm before the next try.
+NSE_COOKIE_DOMAIN = "nseindia.com"
+SESSION_COOKIES = ("nseappid", "nsit", "bm_sv")  # Set by the warm-up; the API rejects requests without them.
+COOKIE_MIN_TTL_S = 30  # Treat cookies expiring sooner than this as already stale [s].
+HTTP_MAX_TRIES = 4  # One attempt plus three retries.
+HTTP_BACKOFF_S = 0.8  # Base delay for the jittered exponential backoff [s].
+
+class _RetryableStatus(RecoverableError):
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}", retry_after=parse_retry_after(response.headers.get("Retry-After")))
+        self.response = response
+
+class NseClient:
+    """Cookie-warmed HTTP/2 client for NSE's JSON API and static report page.
+    Uses the process-wide client from app.http_client unless one is passed in.
+    """
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT_S, client: httpx.Client | None = None):
+        self.timeout = timeout
+        self.sess = client or get_client()
+        self._prepared: dict[str, tuple[tuple[tuple[str, str | None], ...], httpx.Request]] = {}  # url -> (jar snapshot, built GET)
+
+    def _jar_snapshot(self) -> tuple[tuple[str, str | None], ...]:
+        """Name/value of every unexpired cookie: changes whenever the Cookie header httpx would send changes."""
+        now = time.time()
+        return tuple((c.name, c.value) for c in self.sess.cookies.jar if c.expires is None or c.expires > now)
+
+    def _request(self, url: str) -> httpx.Response:
+        """Send a reusable pre-built GET so repeat polls skip header/cookie merging in build_request.
+        build_request bakes in the Cookie header, so the cached request is rebuilt whenever a cookie
+        is set, rotated or expires (tracked via a snapshot of the jar).
+        """
+        snapshot = self._jar_snapshot()
+        cached = self._prepared.get(url)
+        if cached is not None and cached[0] == snapshot:
+            req = cached[1]
+        else:
+            req = self.sess.build_request("GET", url, headers=BROWSER_HEADERS, timeout=self.timeout)
+            self._prepared[url] = (snapshot, req)
+        return self.sess.send(req)
+
+    def _get_once(self, url: str) -> httpx.Response:
+        r = self._request(url)
+        if r.status_code in RETRY_STATUSES:
+            raise _RetryableStatus(r)
+        return r
+
+    def _rewarm_if_rejected(self, e: BaseException) -> None:
+        """Refresh cookies before the next attempt (never after the last one) when NSE rejected them."""
+        if isinstance(e, _RetryableStatus) and e.response.status_code in AUTH_STATUSES:
+            self.boot_session(force=True)
+
+    def _get(self, url: str) -> httpx.Response:
+        """GET with jittered exponential backoff on RETRY_STATUSES; the last response is returned once tries run out."""
+        try:
+            return retry(
+                lambda: self._get_once(url),
+                max_tries=HTTP_MAX_TRIES,
+                base=HTTP_BACKOFF_S,
+                before_retry=self._rewarm_if_rejected,
+            )
+        except _RetryableStatus as e:
+            return e.response
+
+    def _cookies_fresh(self) -> bool:
+        """True if an NSE session cookie is present and not about to expire (session cookies count as fresh)."""
+        deadline = time.time() + COOKIE_MIN_TTL_S
+        return any(
+            c.name in SESSION_COOKIES and (c.expires is None or c.expires > deadline)
+            for c in self.sess.cookies.jar
+        )
+
+    def clear_session_cookies(self) -> None:
+        """Drop every NSE cookie from the (shared) jar so the next boot_session really re-warms."""
+        jar = self.sess.cookies.jar
+        for c in list(jar):
+            if c.domain.lstrip(".").endswith(NSE_COOKIE_DOMAIN):
+                jar.clear(c.domain, c.path, c.name)
+
+    def boot_session(self, force: bool = False) -> None:
+        """Visit the homepage and the reports page so NSE sets its session cookies.
+        Skipped while the jar still holds a fresh NSE session cookie, unless force is set.
+        """
+        if not force and self._cookies_fresh():
+            return
+        for url in (f"{NSE_BASE_URL}/", NSE_URL):
+            self._request(url)  # Single attempt; status is irrelevant, only the Set-Cookie headers matter.
+
+    def get_fiidii_trade(self) -> list[dict[str, Any]]:
+        """Return the raw FII/DII JSON rows."""
+        r = self._get(f"{NSE_BASE_URL}{FII_DII_API_PATH}")
+        r.raise_for_status()
+        return orjson.loads(r.content)  # Decode straight from bytes.
+
+    def get_report_html(self) -> str:
+        """Return the FII/DII reports page HTML, decoded with the charset from the response headers."""
+        r = self._get(NSE_URL)
+        r.raise_for_status()
+        return r.text  # lxml would otherwise guess from raw bytes and mangle ₹ without a <meta charset>.
+
+_CLIENT: NseClient | None = None  # Process-wide client, warmed once and reused across polls.
+_CLIENT_LOCK = threading.Lock()
+
+def _nse_client() -> NseClient:
+    global _CLIENT  # noqa: PLW0603
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = NseClient()
+            _CLIENT.boot_session()
+        return _CLIENT
+
+def _cache_path() -> Path:
+    return NSE_CACHE_DIR / f"fiidii-{datetime.now(IST).date().isoformat()}.json"
+
+def _cache_get() -> list[dict[str, Any]] | None:
+    """Return today's cached API payload if it is younger than NSE_CACHE_TTL_S, else None."""
+    if NSE_CACHE_TTL_S <= 0:
+        return None
+    path = _cache_path()
+    try:
+        if time.time() - path.stat().st_mtime < NSE_CACHE_TTL_S:
+            return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    return None
+
+def _cache_put(data: list[dict[str, Any]]) -> None:
+    if NSE_CACHE_TTL_S <= 0:
+        return
+    path = _cache_path()
+    tmp = path.with_suffix(".tmp")
+    try:
+        NSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(orjson.dumps(data))
+        tmp.replace(path)  # Atomic swap so a concurrent reader never sees a partial file.
+        for old in NSE_CACHE_DIR.glob("fiidii-*.json"):
+            if old != path:
+                old.unlink(missing_ok=True)  # Only today's file is ever read; keep the dir from growing.
+    except OSError:
+        pass  # The cache is best-effort; a write failure must not fail the fetch.
+
+def get_fiidii_trade_json() -> list[dict[str, Any]]:
+    """Return the raw FII/DII JSON rows using the shared, cookie-warmed NseClient.
+    If NSE still rejects the session (AUTH_STATUSES), its cookies are cleared from the shared jar
+    and the client is dropped, so the next call re-warms from scratch.
+    """
+    global _CLIENT  # noqa: PLW0603
+    client = _nse_client()
+    try:
+        return client.get_fiidii_trade()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in AUTH_STATUSES:
+            client.clear_session_cookies()  # The jar outlives NseClient; stale cookies would look fresh
+            with _CLIENT_LOCK:
+                if _CLIENT is client:
+                    _CLIENT = None
+        raise
+
+def _rows_from_api(data: list[dict[str, Any]]) -> list[dict[str, str]]:
+    """Re-key API rows to the table headers used by the rest of the pipeline."""
+    return [{header: str(item[field]).strip() for field, header in API_FIELD_MAP} for item in data]
+
+def _table_rows(table) -> list[dict[str, str]]:
+    """Map thead headers to tbody row cells as list[dict] for an lxml <table> element."""
+    headers = [sys.intern(th.text_content().strip()) for th in table.xpath(".//thead//th")]
+    rows = ([td.text_content().strip() for td in tr.xpath("./td")] for tr in table.xpath(".//tbody/tr"))
+    return [dict(zip(headers, cells)) for cells in rows if cells and len(cells) == len(headers)]
+
+def _rows_from_html(content: str) -> list[dict[str, str]]:
+    """Parse the combined table out of the static reports page HTML."""
+    tree = lxml_html.fromstring(content)
+    tables = tree.xpath("//*[normalize-space(.)=$h]/following::table[1]", h=HEADER_TEXT)
+    if not tables:
+        raise RuntimeError("Combined table not present in static HTML")
+    out = _table_rows(tables[0])
+    if not out:
+        raise RuntimeError("Combined table found in static HTML but has no rows")
+    return out
+
+def _api_rows() -> list[dict[str, str]]:
+    """Rows from the JSON API, served from the same-day cache when it holds a usable payload.
+    Only payloads that yield rows are cached, so an empty or error response is never replayed.
+    """
+    cached = _cache_get()
+    if cached is not None:
+        try:
+            rows = _rows_from_api(cached)
+        except (KeyError, TypeError):
+            rows = []  # Unusable cache entry; refetch below.
+        if rows:
+            return rows
+    data = get_fiidii_trade_json()
+    rows = _rows_from_api(data)
+    if rows:
+        _cache_put(data)
+    return rows
+
+def _fetch_via_http() -> list[dict[str, str]]:
+    """Fetch via the JSON API, falling back to the static report HTML."""
+    try:
+        rows = _api_rows()
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, TypeError):
+        rows = []  # Malformed or blocked API response; try the HTML page instead.
+    return rows or _rows_from_html(_nse_client().get_report_html())
 
 # -------------------------------
 # Locators and synchronization
@@ -88,8 +323,7 @@ def _locate_table(page: Page):
         pass  # Fall through to regex fallback. [web:36]
 
     # Regex fallback anchored to the full string to prevent substring matches.
-    pattern = re.compile(rf"^{re.escape(HEADER_TEXT)}$")  # Full-string anchored regex. [web:36]
-    h2 = page.get_by_text(pattern).first  # Text locator using regex pattern. [web:36]
+    h2 = page.get_by_text(_HEADER_RE).first  # Text locator using regex pattern. [web:36]
     h2.wait_for(timeout=HEADER_APPEAR_MS)  # Wait for the heading by text. [web:36]
     region = h2.locator("xpath=ancestor::*[self::section or self::div][1]")  # Nearest container. [web:36]
     table = region.locator("xpath=.//following::*[self::table][1]").first  # Following table selection. [web:36]
@@ -135,12 +369,13 @@ def _ensure_rows_rendered(page: Page, table_locator):
         pass  # Ignore and raise below. [web:36]
     raise RuntimeError("Combined table visible but has no rows after row-wait")  # Explicit error if empty. [web:36]
 
-def _parse_table(page: Page, table_locator):
-    handle = table_locator.element_handle()  # Get element handle to evaluate JS_PARSE_TABLE. [web:24]
-    if not handle:
-        raise RuntimeError("Table handle not available")  # Structural failure if no handle. [web:24]
+def _parse_rendered_table(table_locator) -> list[dict[str, str]]:
+    """Pull the rendered table's markup in one round-trip and parse it in-process with lxml."""
+    inner = table_locator.inner_html()
+    return _table_rows(lxml_html.fragment_fromstring(f"<table>{inner}</table>"))
 
-    data = page.evaluate(JS_PARSE_TABLE, handle)  # First parse attempt. [web:24]
+def _parse_table(page: Page, table_locator):
+    data = _parse_rendered_table(table_locator)  # First parse attempt. [web:24]
     if not data:
         # Light nudge for late cell renderers.
         try:
@@ -148,7 +383,7 @@ def _parse_table(page: Page, table_locator):
             page.keyboard.press("Home"); time.sleep(KEY_HOME_DELAY_S)  # Return to top. [web:36]
         except Exception:
             pass  # Ignore if keys not supported. [web:36]
-        data = page.evaluate(JS_PARSE_TABLE, handle)  # Second parse attempt. [web:24]
+        data = _parse_rendered_table(table_locator)  # Second parse attempt. [web:24]
 
     if not data:
         raise RuntimeError("Combined table located but empty after retries")  # No data despite readiness. [web:36]
@@ -173,13 +408,73 @@ def _maybe_set_consent_cookies(context):
     except Exception:
         pass  # Safe no-op if adding cookies fails. [web:118]
 
+# -------------------------------
+# Shared browser (lazily started)
+# -------------------------------
+
+BROWSER_ENGINES = {
+    "chromium": {"headless": True, "args": ["--headless=new", "--disable-http2", "--disable-quic"]},  # Chromium with protocol flags. [web:5]
+    "firefox": {"headless": True},  # Firefox fallback. [web:5]
+}  # Engines tried in order; each is launched at most once per process.
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet", "other"})  # Never needed to read table text.
+BLOCKED_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar")  # Analytics/ad beacons.
+
+_browser_lock = threading.Lock()
+_pw: Playwright | None = None  # Playwright driver, started on first browser use.
+_browsers: dict[str, Browser] = {}
+_contexts: dict[str, BrowserContext] = {}
+
+def _block_heavy_resources(route: Route):
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES or any(h in req.url for h in BLOCKED_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+def _get_context(engine_name: str) -> BrowserContext:
+    """Return the warm context for engine_name, launching the browser on first use.
+    Sync Playwright objects are bound to the thread that started the driver, so the cached
+    browsers/contexts must only be used from that one thread (the app_driver main thread);
+    _browser_lock only serialises lazy start-up and shutdown, it does not make them shareable.
+    """
+    global _pw  # noqa: PLW0603
+    with _browser_lock:
+        browser = _browsers.get(engine_name)
+        if browser is not None and browser.is_connected():
+            return _contexts[engine_name]
+        if _pw is None:
+            _pw = sync_playwright().start()  # Non-context-manager form so it outlives this call.
+            atexit.register(_shutdown)
+        browser = getattr(_pw, engine_name).launch(**BROWSER_ENGINES[engine_name])  # Launch browser. [web:5]
+        context = browser.new_context(locale="en-US", user_agent=USER_AGENT)  # Realistic locale and UA. [web:5]
+        _maybe_set_consent_cookies(context)  # Optional consent to avoid blocked content. [web:118]
+        context.route("**/*", _block_heavy_resources)
+        _browsers[engine_name] = browser
+        _contexts[engine_name] = context
+        return context
+
+def _shutdown():
+    """Close every launched browser and stop the Playwright driver (registered with atexit)."""
+    global _pw  # noqa: PLW0603
+    with _browser_lock:
+        for browser in _browsers.values():
+            try:
+                browser.close()  # Ensure browser is closed. [web:5]
+            except Exception:
+                pass  # Ignore close failures. [web:5]
+        _browsers.clear()
+        _contexts.clear()
+        if _pw is not None:
+            try:
+                _pw.stop()
+            except Exception:
+                pass
+            _pw = None
+
 def _scrape_with_page(page: Page):
-    # Navigate; prefer DOMContentLoaded then a short network idle for initial quietness.
+    # Navigate to DOMContentLoaded only; heavy resources are blocked and the table-scoped waits below gate readiness.
     page.goto(NSE_URL, wait_until="domcontentloaded")  # DOM readiness gate. [web:5]
-    try:
-        page.wait_for_load_state("networkidle", timeout=NAV_NETWORK_IDLE_MS)  # Short network idle, not blocking. [web:5]
-    except PWTimeout:
-        pass  # Continue; table-scoped waits follow. [web:5]
 
     # Locate only the combined table under the long heading.
     table = _locate_table(page)  # Strict scoping to the second table. [web:36]
@@ -190,42 +485,37 @@ def _scrape_with_page(page: Page):
     # Parse rows to list of dicts.
     return _parse_table(page, table)  # Return structured data. [web:24]
 
-def fetch_json_data():
+def _scrape_with_engine(engine_name: str):
+    page = _get_context(engine_name).new_page()  # New page in the shared context. [web:5]
+    try:
+        page.set_default_navigation_timeout(PAGE_NAV_DEFAULT_MS)  # Default nav timeout. [web:5]
+        page.set_default_timeout(PAGE_ACTION_DEFAULT_MS)  # Default action timeout. [web:24]
+        return _scrape_with_page(page)  # Execute scrape flow and return data. [web:5]
+    finally:
+        page.close()  # Only the page is per-call; browser and context stay warm.
+
+def _fetch_via_browser():
     """Scrape and return the combined NSE/BSE/MSEI FII/DII table as a list of dict rows. [web:6]"""
-    with sync_playwright() as p:
-        attempts = (
-            (p.chromium, {"headless": True, "args": ["--headless=new", "--disable-http2", "--disable-quic"]}),  # Chromium with protocol flags. [web:5]
-            (p.firefox, {"headless": True}),  # Firefox fallback. [web:5]
-        )  # Try multiple engines to improve resilience. [web:5]
-        last_err: Exception | None = None  # Track last error for surfacing. [web:5]
-        for engine, launch_kwargs in attempts:
-            browser = engine.launch(**launch_kwargs)  # Launch browser. [web:5]
-            try:
-                context = browser.new_context(
-                    locale="en-US",
-                    user_agent=(
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                    ),
-                )  # Realistic locale and UA. [web:5]
-                _maybe_set_consent_cookies(context)  # Optional consent to avoid blocked content. [web:118]
-
-                page = context.new_page()  # New page in context. [web:5]
-                page.set_default_navigation_timeout(PAGE_NAV_DEFAULT_MS)  # Default nav timeout. [web:5]
-                page.set_default_timeout(PAGE_ACTION_DEFAULT_MS)  # Default action timeout. [web:24]
-
-                return _scrape_with_page(page)  # Execute scrape flow and return data. [web:5]
-            except Exception as e:
-                last_err = e  # Save error to raise if all engines fail. [web:5]
-                time.sleep(ENGINE_RETRY_DELAY_S)  # Stagger between engines. [web:118]
-            finally:
-                try:
-                    browser.close()  # Ensure browser is closed. [web:5]
-                except Exception:
-                    pass  # Ignore close failures. [web:5]
-        if last_err:
-            raise last_err  # Propagate the last encountered error. [web:5]
-        raise RuntimeError("Unknown error while scraping combined NSE table")  # Safety net. [web:5]
+    engines = iter(BROWSER_ENGINES)  # Each retry moves on to the next engine. [web:5]
+    return retry(
+        lambda: _scrape_with_engine(next(engines)),
+        max_tries=len(BROWSER_ENGINES),
+        base=ENGINE_RETRY_DELAY_S,  # Jittered, doubling stagger between engines. [web:118]
+        retry_on=(Exception,),  # The last engine's error propagates. [web:5]
+    )
+
+def fetch_json_data():
+    """
+    Return the combined NSE/BSE/MSEI FII/DII table as a list of dict rows.
+    Uses plain HTTP (JSON API, then static HTML); the Playwright scraper only runs
+    when that fails and NSE_USE_BROWSER=1 is set.
+    """
+    try:
+        return _fetch_via_http()
+    except Exception:
+        if not USE_BROWSER:
+            raise
+    return _fetch_via_browser()  # Last resort: full browser render.
 
 if __name__ == "__main__":
     print(fetch_json_data())  # Run scraper and print list[dict] rows. [web:5]
@@ -1,101 +1,129 @@
 # app/services/ins_data.py
 from __future__ import annotations
-from datetime import datetime, date
-from decimal import Decimal
+import sys
+from datetime import date
+from functools import lru_cache
 from typing import Any, TypedDict
-from contextlib import contextmanager
 
-import pytz
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.db import get_session
+from app.db import engine
 from app.models import TNseFiiDiiEqData
 
-# Define IST timezone
-IST = pytz.timezone("Asia/Kolkata")
+# Core (not ORM) upsert: a new run_dt is inserted, an existing one only gets u_ts bumped.
+# xmax = 0 holds only for freshly inserted tuples, so RETURNING tells the two apart in one round-trip.
+_table = TNseFiiDiiEqData.__table__
+_ins = pg_insert(_table)
+CORE_UPSERT = _ins.on_conflict_do_update(
+    index_elements=[_table.c.run_dt],
+    set_={"u_ts": func.now()},  # i_ts comes from the column's server default
+).returning(literal_column("xmax = 0").label("inserted"))
+
+# Amounts are written as integer hundredths of a crore; a table still on numeric(9,2) would
+# accept them silently and store every value 100x too large.
+_AMOUNT_TYPE_SQL = text(
+    "SELECT data_type FROM information_schema.columns WHERE table_name = :t AND column_name = 'dii_buy'"
+)
+
+
+@lru_cache(maxsize=1)
+def _check_amount_schema() -> None:
+    """Fail fast (once per process; failures aren't cached) unless the amount columns are bigint."""
+    with engine.connect() as conn:
+        data_type = conn.execute(_AMOUNT_TYPE_SQL, {"t": _table.name}).scalar()
+    if data_type != "bigint":
+        raise RuntimeError(
+            f"{_table.name}.dii_buy is {data_type!r}, expected bigint; "
+            "apply db_migrate_amounts_to_bigint.sql before running this version"
+        )
+
+
+# Scraped table headers and, per category, the Category prefixes and payload fields its row feeds
+# Interned so lookups on rows keyed by br_nse hit dict's identity fast path (non-ASCII literals aren't auto-interned)
+_K_BUY = sys.intern("Buy Value(₹ Crores)")
+_K_SELL = sys.intern("Sell Value (₹ Crores)")
+_MAP = (
+    (("DII",), "dii_buy", "dii_sell", "dii_net"),
+    (("FII", "FPI"), "fii_buy", "fii_sell", "fii_net"),  # NSE labels foreign flows either way
+)
+_TRANS = str.maketrans("", "", ", ₹")
+_MONTH_ABBR = {m: i for i, m in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
 
 
 class EqPayload(TypedDict):
+    """Amounts in integer hundredths of a ₹ crore (see TNseFiiDiiEqData)."""
     run_dt: date
-    dii_buy: Decimal | None
-    dii_sell: Decimal | None
-    dii_net: Decimal | None
-    fii_buy: Decimal | None
-    fii_sell: Decimal | None
-    fii_net: Decimal | None
+    dii_buy: int | None
+    dii_sell: int | None
+    dii_net: int | None
+    fii_buy: int | None
+    fii_sell: int | None
+    fii_net: int | None
+
+
+def _to_date(d: str) -> date:
+    """Parse NSE's "03-Oct-2025" (full month names tolerated) without going through strptime."""
+    dd, mon, yy = d.strip().split("-")
+    month = _MONTH_ABBR.get(mon[:3].title())
+    if month is None:
+        raise ValueError(f"Unrecognised month in date {d!r}")
+    return date(int(yy), month, int(dd))
+
+
+def _d(s: str | None) -> int | None:
+    """Parse a ₹ crore amount like "15,515.91" into hundredths (1551591).
+    One translate() pass drops commas, spaces and ₹; inputs carry at most 2 decimals.
+    """
+    s = s.translate(_TRANS) if s else s
+    return round(float(s) * 100) if s else None
 
 
 def transform_rows(rows: list[dict[str, Any]]) -> EqPayload:
-    dii_row = next((r for r in rows if r.get("Category", "").strip().startswith("DII")), None)
-    fii_row = next((r for r in rows if r.get("Category", "").strip().startswith("FII")), None)
-    if not dii_row or not fii_row:
+    picked: list[dict[str, Any] | None] = [None] * len(_MAP)
+    for r in rows:  # Single pass; the first row per category wins
+        cat = (r.get("Category") or "").strip().upper()
+        for i, (prefixes, *_) in enumerate(_MAP):
+            if picked[i] is None and cat.startswith(prefixes):
+                picked[i] = r
+                break
+    if None in picked:
         raise ValueError("Expected both DII and FII/FPI rows in payload")
 
-    def _to_date(d: str) -> date:
-        return datetime.strptime(d.strip(), "%d-%b-%Y").date()
-
-    def _to_decimal(s: str | None) -> Decimal | None:
-        if s is None:
-            return None
-        s = s.strip().replace(",", "")
-        return None if s == "" else Decimal(s)
-
-    run_dt = _to_date(dii_row["Date"])
-    return {
-        "run_dt": run_dt,
-        "dii_buy": _to_decimal(dii_row.get("Buy Value(₹ Crores)")),
-        "dii_sell": _to_decimal(dii_row.get("Sell Value (₹ Crores)")),
-        "dii_net": _to_decimal(dii_row.get("Net Value (₹ Crores)")),
-        "fii_buy": _to_decimal(fii_row.get("Buy Value(₹ Crores)")),
-        "fii_sell": _to_decimal(fii_row.get("Sell Value (₹ Crores)")),
-        "fii_net": _to_decimal(fii_row.get("Net Value (₹ Crores)")),
-    }
-
-
-@contextmanager
-def session_scope():
-    s = get_session()
-    try:
-        yield s
-        s.commit()
-    except Exception:
-        s.rollback()
-        raise
-    finally:
-        s.close()
+    payload: dict[str, Any] = {"run_dt": _to_date(picked[0]["Date"])}
+    for row, (_, buy_key, sell_key, net_key) in zip(picked, _MAP):
+        buy, sell = _d(row.get(_K_BUY)), _d(row.get(_K_SELL))
+        payload[buy_key] = buy
+        payload[sell_key] = sell
+        payload[net_key] = None if buy is None or sell is None else buy - sell  # Net column is redundant
+    return payload
 
 
-def insert_eq_data(payload: EqPayload) -> bool:
-    """Attempt to insert; return True on success.
-    On any primary key/unique-like collision, return False and exit gracefully.
+def insert_eq_data(payload: EqPayload | list[EqPayload]) -> bool:
+    """Upsert one payload or a batch of them in a single statement; return True if any row was new.
+    Rows whose run_dt already exists keep their amounts and only have u_ts set to this call's timestamp.
     """
 
-    def _net(buy: Decimal | None, sell: Decimal | None) -> Decimal | None:
+    def _net(buy: int | None, sell: int | None) -> int | None:
         if buy is None or sell is None:
             return None
-        return (buy - sell).quantize(Decimal("0.01"))
-
-    dii_net = payload["dii_net"] if payload["dii_net"] is not None else _net(payload["dii_buy"], payload["dii_sell"])
-    fii_net = payload["fii_net"] if payload["fii_net"] is not None else _net(payload["fii_buy"], payload["fii_sell"])
-
-    # Generate IST timestamp for insertion
-    i_ts_ist = datetime.now(IST)
-
-    with session_scope() as s:
-        try:
-            row = TNseFiiDiiEqData(
-                run_dt=payload["run_dt"],
-                dii_buy=payload["dii_buy"],
-                dii_sell=payload["dii_sell"],
-                dii_net=dii_net,
-                fii_buy=payload["fii_buy"],
-                fii_sell=payload["fii_sell"],
-                fii_net=fii_net,
-                i_ts=i_ts_ist,  # New IST timestamp column
-            )
-            s.add(row)
-            s.flush()
-            return True
-        except IntegrityError:
-            s.rollback()
-            return False
+        return buy - sell
+
+    payloads = [payload] if isinstance(payload, dict) else payload
+    if not payloads:
+        return False
+
+    # Keyed by run_dt: ON CONFLICT DO UPDATE may not touch the same row twice in one statement.
+    rows = {
+        p["run_dt"]: {
+            **p,
+            "dii_net": p["dii_net"] if p["dii_net"] is not None else _net(p["dii_buy"], p["dii_sell"]),
+            "fii_net": p["fii_net"] if p["fii_net"] is not None else _net(p["fii_buy"], p["fii_sell"]),
+        }
+        for p in payloads
+    }
+
+    _check_amount_schema()
+    with engine.begin() as conn:
+        result = conn.execute(CORE_UPSERT, list(rows.values()))  # executemany, batched via insertmanyvalues
+        return any(result.scalars())
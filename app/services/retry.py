@@ -0,0 +1,59 @@
+# app/services/retry.py
+"""Bounded exponential backoff with jitter for transient network failures."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+
+
+class RecoverableError(Exception):
+    """Transient failure worth another attempt; retry_after [s] overrides the computed backoff."""
+
+    def __init__(self, *args: object, retry_after: float | None = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a Retry-After header in delta-seconds form; None if absent or an HTTP date."""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry[T](  # noqa: PLR0913  (keyword-only tuning knobs)
+    fn: Callable[[], T],
+    *,
+    max_tries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    retry_on: tuple[type[BaseException], ...] = (RecoverableError,),
+    before_retry: Callable[[BaseException], None] | None = None,
+) -> T:
+    """
+    Call fn until it returns, re-raising once max_tries attempts have failed.
+    After the n-th failure (0-based) sleep base * 2**n * (1 + jitter), jitter ~ U(0, 1),
+    capped at cap seconds. A RecoverableError's retry_after is honoured as-is, or re-raised
+    at once if it exceeds cap (retrying earlier would only burn the remaining attempts).
+    Exceptions not listed in retry_on propagate immediately.
+    before_retry(e), if given, runs after the sleep and only when another attempt follows.
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except retry_on as e:
+            if attempt + 1 >= max_tries:
+                raise
+            delay = getattr(e, "retry_after", None)
+            if delay is None:
+                delay = min(base * 2**attempt * (1 + random.uniform(0, 1)), cap)
+            elif delay > cap:
+                raise
+            time.sleep(delay)
+            if before_retry is not None:
+                before_retry(e)
+            attempt += 1
@@ -0,0 +1,33 @@
+# app/settings.py
+"""Process-wide configuration. .env is loaded once, here, on first import."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str | None
+    bot_token: str | None
+    chat_id: str | None
+    api_url: str | None  # Telegram sendMessage endpoint, None without a bot token
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    bot_token = os.getenv("BOT_TOKEN")
+    return Settings(
+        database_url=os.getenv("DATABASE_URL"),
+        bot_token=bot_token,
+        chat_id=os.getenv("CHAT_ID"),
+        api_url=f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        if bot_token
+        else None,
+    )
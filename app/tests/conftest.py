@@ -0,0 +1,6 @@
+# app/tests/conftest.py
+import os
+
+# app.db refuses to import without a URL and app.settings caches it on first use, so set a
+# placeholder before any test module is collected; offline checks never open a connection.
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/unused")
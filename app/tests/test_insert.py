@@ -15,7 +15,7 @@ def main():
         if inserted:
             print("Inserted: True")
         else:
-            print("Insert skipped: primary key already exists for this run_dt.")
+            print("Insert skipped: run_dt already exists, u_ts bumped instead.")
     except IntegrityError as err:
         # For integrity errors other than primary key/unique collision
         print("Insert failed due to integrity error:", str(err))
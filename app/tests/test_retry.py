@@ -0,0 +1,131 @@
+# app/tests/test_retry.py
+# Offline checks for the jittered backoff helper (sleeps are recorded, not taken).
+# python -m app.tests.test_retry
+import app.services.retry as retry_mod
+from app.services.retry import RecoverableError, parse_retry_after, retry
+
+
+def _flaky(failures: int, retry_after: float | None = None):
+    calls = [0]
+
+    def fn() -> str:
+        calls[0] += 1
+        if calls[0] <= failures:
+            raise RecoverableError("transient", retry_after=retry_after)
+        return "ok"
+
+    return fn, calls
+
+
+def _with_recorded_sleep(check):
+    slept: list[float] = []
+    saved = retry_mod.time.sleep
+    retry_mod.time.sleep = slept.append
+    try:
+        check(slept)
+    finally:
+        retry_mod.time.sleep = saved
+
+
+def test_succeeds_after_transient_failures():
+    def check(slept):
+        fn, calls = _flaky(2)
+        assert retry(fn, max_tries=3, base=1.0) == "ok"
+        assert calls[0] == 3
+        assert 1.0 <= slept[0] <= 2.0 and 2.0 <= slept[1] <= 4.0  # base * 2**n * (1 + U(0, 1))
+
+    _with_recorded_sleep(check)
+
+
+def test_exhausted_tries_reraise():
+    def check(slept):
+        fn, calls = _flaky(5)
+        try:
+            retry(fn, max_tries=3)
+            raise AssertionError("expected RecoverableError")
+        except RecoverableError:
+            pass
+        assert calls[0] == 3 and len(slept) == 2
+
+    _with_recorded_sleep(check)
+
+
+def test_backoff_is_capped():
+    def check(slept):
+        fn, _ = _flaky(2)
+        retry(fn, max_tries=3, base=100.0, cap=5.0)
+        assert slept == [5.0, 5.0]
+
+    _with_recorded_sleep(check)
+
+
+def test_retry_after_is_honoured_up_to_cap():
+    def check(slept):
+        fn, _ = _flaky(1, retry_after=7.0)
+        assert retry(fn, cap=30.0) == "ok"
+        assert slept == [7.0]
+
+    _with_recorded_sleep(check)
+
+
+def test_retry_after_above_cap_gives_up_at_once():
+    def check(slept):
+        fn, calls = _flaky(1, retry_after=120.0)
+        try:
+            retry(fn, max_tries=3, cap=30.0)
+            raise AssertionError("expected RecoverableError")
+        except RecoverableError:
+            pass
+        assert calls[0] == 1 and slept == []
+
+    _with_recorded_sleep(check)
+
+
+def test_unlisted_exceptions_propagate():
+    calls = [0]
+
+    def fn():
+        calls[0] += 1
+        raise ValueError("not retryable")
+
+    try:
+        retry(fn, max_tries=3)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    assert calls[0] == 1
+
+
+def test_before_retry_skips_last_attempt():
+    def check(slept):
+        seen: list[BaseException] = []
+        fn, _ = _flaky(5)
+        try:
+            retry(fn, max_tries=3, before_retry=seen.append)
+        except RecoverableError:
+            pass
+        assert len(seen) == 2  # Before tries 2 and 3, never after the final failure
+
+    _with_recorded_sleep(check)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def main():
+    test_succeeds_after_transient_failures()
+    test_exhausted_tries_reraise()
+    test_backoff_is_capped()
+    test_retry_after_is_honoured_up_to_cap()
+    test_retry_after_above_cap_gives_up_at_once()
+    test_unlisted_exceptions_propagate()
+    test_before_retry_skips_last_attempt()
+    test_parse_retry_after()
+    print("retry checks passed")
+
+
+if __name__ == "__main__":
+    main()
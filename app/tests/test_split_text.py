@@ -0,0 +1,68 @@
+# app/tests/test_split_text.py
+# Offline checks for Telegram message chunking and resume-after-failure (no network).
+# python -m app.tests.test_split_text
+import app.services.bot_json_msg as bot
+from app.services.bot_json_msg import TelegramSendError, _split_text
+
+
+def _body(chunk: str) -> str:
+    assert chunk.startswith("<pre>") and chunk.endswith("</pre>")
+    return chunk[len("<pre>"):-len("</pre>")]
+
+
+def test_short_text_is_one_chunk():
+    text = "<pre>head\nDII: Buy 1 | Sell 2 | Net -1</pre>"
+    assert _split_text(text) == [text]
+
+
+def test_long_line_is_hard_split_within_limit():
+    long_line = "x" * 9000
+    text = f"<pre>head\n{long_line}\n\nlast</pre>"
+    chunks = _split_text(text)
+    assert len(chunks) > 1
+    assert all(len(c) <= bot._MAX_TEXT for c in chunks)
+    # Nothing lost or reordered: joining the bodies gives back the original lines
+    joined = "".join(_body(c) for c in chunks).replace("\n", "")
+    assert joined == "head" + long_line + "last"
+
+
+def test_retry_resumes_after_failed_chunk():
+    sent: list[str] = []
+    fail_at = [2]
+
+    def fake_send(chunk: str) -> None:
+        if len(sent) == fail_at[0]:
+            fail_at[0] = -1
+            raise TelegramSendError("boom")
+        sent.append(chunk)
+
+    saved = (bot.BOT_TOKEN, bot.CHAT_ID, bot.API_URL, bot._send_text, bot._LAST_SENT)
+    bot.BOT_TOKEN, bot.CHAT_ID, bot.API_URL = "token", "chat", "https://example.invalid"
+    bot._send_text, bot._LAST_SENT = fake_send, (b"", 0)
+    try:
+        rows = [{"Category": "X" * 9000, "Date": "03-Oct-2025"}]
+        expected = _split_text(bot._format_rows_to_text(rows))
+        assert len(expected) > fail_at[0]
+        try:
+            bot.bot_json_msg(rows)
+            raise AssertionError("first send should fail")
+        except TelegramSendError:
+            pass
+        assert sent == expected[:2]
+        bot.bot_json_msg(rows)  # Resumes at chunk 3, no duplicates
+        assert sent == expected
+        bot.bot_json_msg(rows)  # Fully delivered: skipped
+        assert sent == expected
+    finally:
+        bot.BOT_TOKEN, bot.CHAT_ID, bot.API_URL, bot._send_text, bot._LAST_SENT = saved
+
+
+def main():
+    test_short_text_is_one_chunk()
+    test_long_line_is_hard_split_within_limit()
+    test_retry_resumes_after_failed_chunk()
+    print("split_text checks passed")
+
+
+if __name__ == "__main__":
+    main()
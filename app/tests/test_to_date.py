@@ -0,0 +1,40 @@
+# app/tests/test_to_date.py
+# Offline checks for NSE run-date parsing (no database connection is opened).
+# python -m app.tests.test_to_date
+import os
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/unused")  # app.db needs a URL to import
+
+from app.services.ins_data import _to_date
+
+
+def test_nse_format():
+    assert _to_date("03-Oct-2025") == date(2025, 10, 3)
+    assert _to_date(" 31-Dec-2024 ") == date(2024, 12, 31)
+
+
+def test_case_and_full_month_names():
+    assert _to_date("3-OCT-2025") == date(2025, 10, 3)
+    assert _to_date("03-October-2025") == date(2025, 10, 3)
+    assert _to_date("01-sept-2025") == date(2025, 9, 1)
+
+
+def test_bad_input_raises_value_error():
+    for bad in ("03/10/2025", "03-Foo-2025", "32-Oct-2025", "", "03-Oct"):
+        try:
+            _to_date(bad)
+            raise AssertionError(f"expected ValueError for {bad!r}")
+        except ValueError:
+            pass
+
+
+def main():
+    test_nse_format()
+    test_case_and_full_month_names()
+    test_bad_input_raises_value_error()
+    print("_to_date checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# app/tests/test_transform_rows.py
+# Offline checks for row picking in transform_rows (no database connection is opened).
+# python -m app.tests.test_transform_rows
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/unused")  # app.db needs a URL to import
+
+from app.services.ins_data import transform_rows
+
+
+def _row(category: str, buy: str, sell: str) -> dict[str, str]:
+    return {
+        "Category": category,
+        "Date": "03-Oct-2025",
+        "Buy Value(₹ Crores)": buy,
+        "Sell Value (₹ Crores)": sell,
+        "Net Value (₹ Crores)": "",
+    }
+
+
+def test_fii_and_dii_rows():
+    payload = transform_rows([_row("DII **", "13,448.61", "12,920.13"), _row("FII/FPI *", "16,496.43", "17,999.55")])
+    assert payload["dii_buy"] == 1344861 and payload["dii_net"] == 52848
+    assert payload["fii_sell"] == 1799955 and payload["fii_net"] == -150312
+
+
+def test_fpi_label_feeds_fii_columns():
+    payload = transform_rows([_row("FPI *", "₹ 1,234.56", "200"), _row("dii", "10", "5.5")])
+    assert payload["fii_buy"] == 123456 and payload["fii_sell"] == 20000
+    assert payload["dii_buy"] == 1000 and payload["dii_net"] == 450
+
+
+def test_first_row_per_category_wins():
+    payload = transform_rows([_row("DII", "1", "0"), _row("FII", "2", "0"), _row("DII again", "9", "0")])
+    assert payload["dii_buy"] == 100
+
+
+def test_missing_category_raises():
+    try:
+        transform_rows([_row("DII", "1", "0"), _row("Other", "2", "0")])
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+
+
+def main():
+    test_fii_and_dii_rows()
+    test_fpi_label_feeds_fii_columns()
+    test_first_row_per_category_wins()
+    test_missing_category_raises()
+    print("transform_rows checks passed")
+
+
+if __name__ == "__main__":
+    main()
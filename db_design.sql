@@ -1,11 +1,14 @@
+-- Amounts are integer hundredths of a ₹ crore (i.e. ₹ lakh): 15,515.91 Cr is stored as 1551591
+-- Deploy order for existing databases: apply db_migrate_amounts_to_bigint.sql (and db_migrate_i_ts_default.sql)
+-- before running the app; insert_eq_data refuses to write while the amount columns are not bigint.
 CREATE TABLE t_nse_fii_dii_eq_data (
   run_dt   date PRIMARY KEY,
-  dii_buy  numeric(9,2) NOT NULL,
-  dii_sell numeric(9,2) NOT NULL,
-  dii_net  numeric(7,2) NOT NULL,
-  fii_buy  numeric(9,2) NOT NULL,
-  fii_sell numeric(9,2) NOT NULL,
-  fii_net  numeric(7,2) NOT NULL,
-  i_ts    timestamptz,
+  dii_buy  bigint NOT NULL,
+  dii_sell bigint NOT NULL,
+  dii_net  bigint NOT NULL,
+  fii_buy  bigint NOT NULL,
+  fii_sell bigint NOT NULL,
+  fii_net  bigint NOT NULL,
+  i_ts    timestamptz DEFAULT now(),
   u_ts    timestamptz
 );
@@ -0,0 +1,11 @@
+-- One-time migration for databases created from the original numeric(9,2)/numeric(7,2) schema.
+-- Rewrites every amount as integer hundredths of a ₹ crore (see db_design.sql).
+BEGIN;
+ALTER TABLE t_nse_fii_dii_eq_data
+  ALTER COLUMN dii_buy  TYPE bigint USING round(dii_buy  * 100),
+  ALTER COLUMN dii_sell TYPE bigint USING round(dii_sell * 100),
+  ALTER COLUMN dii_net  TYPE bigint USING round(dii_net  * 100),
+  ALTER COLUMN fii_buy  TYPE bigint USING round(fii_buy  * 100),
+  ALTER COLUMN fii_sell TYPE bigint USING round(fii_sell * 100),
+  ALTER COLUMN fii_net  TYPE bigint USING round(fii_net  * 100);
+COMMIT;
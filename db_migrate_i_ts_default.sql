@@ -0,0 +1,3 @@
+-- One-time migration for databases created before i_ts had a server-side default.
+-- The app no longer sends i_ts/u_ts; Postgres stamps them with now() (see db_design.sql).
+ALTER TABLE t_nse_fii_dii_eq_data ALTER COLUMN i_ts SET DEFAULT now();